@@ -10,11 +10,115 @@ and process only the rows having the "website" column empty.
 '''
 
 from search_engines import *
-from time import sleep
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
 
 import sys, getopt, csv, re
 
 
+_SENT_CHARS = '.!?'
+
+# sentence_find stops counting at this number of sentences
+_SENT_MAX = 5
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def word_boundary(w, i):
+    '''Checks for a word boundary inside the word @w before its character No.@i
+
+    Input
+        @w: str
+        @i: int
+
+    Returns
+        bool
+    '''
+
+    return bool(_WORD_RE.match(w[i - 1])) != bool(_WORD_RE.match(w[i]))
+
+
+def words_pattern(words, sentences=False):
+    '''Returns a single compiled pattern finding every position where any of the
+    whole lowercased @words begins in a lowercased text, the word found is its
+    group 1. Only the longest word is found at a position, so the pattern comes
+    along with a dict of the words implied by each word found: the word itself
+    and the shorter @words it begins with. If @sentences is set the pattern
+    also matches sentence-ending chars, leaving group 1 empty
+
+    Input
+        @words:     list of str
+        @sentences: bool
+
+    Returns
+        tuple -> (re.Pattern, dict of str: tuple of str)
+    '''
+
+    return compile_words_pattern(tuple(sorted(set(words))), sentences)
+
+
+@lru_cache(maxsize=256)
+def compile_words_pattern(words, sentences):
+    '''Compiles the pattern of "words_pattern". The words come from the rows,
+    so only the patterns of the recent rows are kept
+
+    Input
+        @words:     sorted tuple of unique str
+        @sentences: bool
+
+    Returns
+        tuple -> (re.Pattern, dict of str: tuple of str)
+    '''
+
+    low = {w.lower() for w in words}
+
+    # Texts are lowercased once, so the pattern does without re.IGNORECASE
+    alt = '|'.join(map(re.escape, sorted(low, key=len, reverse=True)))
+    pat = r'(?=\b(' + alt + r')\b)'
+
+    if sentences:
+        pat = r'[\.!?]|' + pat
+
+    implied = {
+        a: tuple(b for b in low if a.startswith(b) and (len(b) == len(a) or word_boundary(a, len(b))))
+            for a in low
+    }
+
+    return re.compile(pat), implied
+
+
+@lru_cache(maxsize=32)
+def str_lower(s):
+    '''Returns lowercased string @s. The same webpage contents are searched by
+    many rules, so the recent results are kept and every text is lowercased
+    once per webpage
+
+    Input
+        @s: str
+
+    Returns
+        str
+    '''
+
+    return s.lower()
+
+
+@lru_cache(maxsize=32)
+def str_words(s):
+    '''Returns the set of lowercased words of string @s, i.e. the sequences of
+    word characters between the word boundaries. The recent results are kept
+
+    Input
+        @s: str
+
+    Returns
+        frozenset of str
+    '''
+
+    return frozenset(_WORD_RE.findall(str_lower(s)))
+
+
 def words_filter(s, num_chr=2):
     '''For a given string @s the function strips accents and other
     special chars. It also keeps words longer than @num_chr only.
@@ -47,12 +151,30 @@ def words_find(s, words):
         float
     '''
 
-    f = 0
+    # No words give no match, as an empty search string does in "str_find_all"
+    if not words:
+        return 0
+
+    # Words of word characters only are matched by a lookup in the set of
+    # words of @s, however many words are searched
+    if all(_WORD_RE.fullmatch(w) for w in words):
+        found = str_words(s)
+        words = [w.lower() for w in words]
+
+        return sum(w in found for w in words) / len(words)
+
+    p, implied = words_pattern(words)
+
+    found = set()
 
-    for w in words:
-        f += bool(re.search(r'\b{}\b'.format(w), s, re.IGNORECASE))
+    for m in p.finditer(str_lower(s)):
+        found.update(implied[m.group(1)])
 
-    return f / len(words)
+    return sum(w.lower() in found for w in words) / len(words)
+
+# Upper bound of the result. UrlFinder stops applying the rules to a webpage
+# once the rest of them can not make its URL the best one
+words_find.max_result = 1
 
 
 def words_find_all(s, words):
@@ -68,9 +190,11 @@ def words_find_all(s, words):
 
     return words_find(s, words) >= 1
 
+words_find_all.max_result = 1
+
 
 def sentence_find(s, words):
-    '''Counts the amount sentences in @s containing all @words
+    '''Counts the amount sentences in @s containing all @words, up to @_SENT_MAX
 
     Input
         @s:     str
@@ -79,12 +203,43 @@ def sentence_find(s, words):
     Returns
         int
     '''
-    f = 0
 
-    for l in re.split(r'[\.!?]', s):
-        f += words_find_all(l.strip(), words)
+    # No words give no match, and words containing sentence-ending chars never
+    # fit into a single sentence
+    if not words or any(c in w for w in words for c in _SENT_CHARS):
+        return 0
+
+    # No sentence contains all the words if the whole text does not. Mostly it
+    # is a lookup in the cached set of words of @s, which rejects the most of
+    # webpages without scanning them sentence by sentence
+    if not words_find_all(s, words):
+        return 0
+
+    p, implied = words_pattern(words, True)
+
+    # Each distinct word holds its own bit in the mask of words seen so far in
+    # the current sentence, a word found sets the bits of all words it implies
+    bits = {w: 1 << i for i, w in enumerate(implied)}
+    bits = {w: sum(bits[v] for v in implied[w]) for w in implied}
+    full = (1 << len(implied)) - 1
+
+    f = mask = 0
 
-    return f
+    for m in p.finditer(str_lower(s)):
+        t = m.group(1)
+
+        if t is None:
+            f += mask == full
+            mask = 0
+
+            if f >= _SENT_MAX:
+                return f
+        else:
+            mask |= bits[t]
+
+    return f + (mask == full)
+
+sentence_find.max_result = _SENT_MAX
 
 
 def str_filter(s):
@@ -102,7 +257,9 @@ def str_filter(s):
 
 
 def str_find_all(s, s2):
-    '''Checks accent-insensitive occurrence of string @s2 in the string @s
+    '''Checks case-insensitive occurrence of string @s2 in the string @s. Both
+    strings are expected to be accent-stripped already: @s by UrlFinder and @s2
+    by "str_filter"
 
     Input
         @s:  str (searchable string)
@@ -112,7 +269,9 @@ def str_find_all(s, s2):
         bool
     '''
 
-    return bool(s2 and re.search(UrlFinder.strip_accents(s2), s, re.IGNORECASE))
+    return bool(s2) and s2.lower() in str_lower(s)
+
+str_find_all.max_result = 1
 
 
 def str_find(s, s2):
@@ -128,6 +287,48 @@ def str_find(s, s2):
 
     return s.find(s2) >= 0
 
+str_find.max_result = 1
+
+
+# Validation rules used to check the URL for being an address of the corporate
+# website, see "main" for the description
+PROC = {
+    'name': [
+        (str_filter,   str_find_all,   1.0, UrlFinder.html_title),
+        (words_filter, words_find_all, 0.3, UrlFinder.html_title),
+        (words_filter, words_find,     0.1, UrlFinder.html_title),
+        (str_filter,   str_find_all,   1.0, UrlFinder.meta_description),
+        (words_filter, words_find_all, 0.3, UrlFinder.meta_description),
+        (words_filter, words_find,     0.1, UrlFinder.meta_description),
+        (str_filter,   str_find_all,   1.0, UrlFinder.h1_text),
+        (words_filter, words_find_all, 0.3, UrlFinder.h1_text),
+        (words_filter, words_find,     0.1, UrlFinder.h1_text),
+        (str_filter,   str_find_all,   1.0, UrlFinder.body_text),
+        (words_filter, sentence_find,  0.5, UrlFinder.body_text),
+    ],
+    'city': [
+        (str_filter,   str_find_all,   0.1, UrlFinder.html_title),
+        (str_filter,   str_find_all,   0.1, UrlFinder.meta_description),
+        (str_filter,   str_find_all,  0.05, UrlFinder.body_text),
+    ],
+    'country': [
+        (str_filter,   str_find_all,   0.1, UrlFinder.html_title),
+        (str_filter,   str_find_all,   0.1, UrlFinder.meta_description),
+        (str_filter,   str_find_all,  0.05, UrlFinder.body_text),
+    ],
+    'phone': [
+        (str_filter,   str_find,       1.0, UrlFinder.html_title),
+        (str_filter,   str_find,       0.5, UrlFinder.meta_description),
+        (str_filter,   str_find,       0.1, UrlFinder.body_text),
+    ],
+    'postcode': [
+        (str_filter,   str_find,       0.1, UrlFinder.body_text),
+    ],
+    'street_line_1': [
+        (str_filter,   str_find_all,   0.5, UrlFinder.body_text),
+    ],
+}
+
 
 def help_and_quit(err_msg=None):
     '''Displays help information
@@ -140,7 +341,7 @@ def help_and_quit(err_msg=None):
 '''
 This web crawler finds corporate websites using information from the input CSV file.
 
-$ python crawler.py -i <filename> -o <filename> [-s <number>] [-l <number>] [-u] [-h]
+$ python crawler.py -i <filename> -o <filename> [-s <number>] [-l <number>] [-w <number>] [-p <number>] [-u] [-h]
 
 Options:
     -i <filename>   Specifies input CSV file. Mandatory option.
@@ -150,6 +351,11 @@ Options:
                     If omitted, the process starts from the beginning of the input file.
     -l <number>     Limits number of rows to process. Optional.
                     If omitted, the process runs until the end of the input file will be reached.
+    -w <number>     Specifies how many rows to process concurrently. Optional.
+                    If omitted, 4 rows are processed at a time. The search engines
+                    requests are still limited by the engine's delay.
+    -p <number>     Specifies how many worker processes parse and validate the
+                    webpages. Optional. If omitted, it is done by the rows' threads.
     -u              Updates existing URLs. Optional.
                     By default, the rows having "website" column already filled is not processed.
                     Use this parameter to force crawling process again for the such rows.
@@ -159,7 +365,7 @@ Options:
     quit()
 
 
-def main(fn_input, fn_output, start, limit):
+def main(fn_input, fn_output, start, limit, workers=4, chunksize=256, processes=0):
     '''Main processing function
 
     The crawler builds around @UrlFinder class and its method ".get" which
@@ -178,7 +384,7 @@ def main(fn_input, fn_output, start, limit):
        service. It also requires having <App ID> and <API Key>. The second one
        uses parsing of search results taken on the "Google Search" website, which
        is free of charge but the requests to the website are time-limited.
-    2) keyword argument @proc:dict defines a series of validation rules used to
+    2) argument @proc:dict (module-level @PROC) defines a series of validation rules used to
        check the URL for being an address of the corporate website. The @proc's
        keys represent column names from the input CSV file. And the @proc's
        values are lists of tuples. Each tuple represents a validation rule:
@@ -189,86 +395,99 @@ def main(fn_input, fn_output, start, limit):
     4) keyword argument @home_only:bool defines skipping non-homepage URLs;
     5) keyword argument @threshold:float is a value of weight for the URLs
        to be filtered below or equal this value. Set it to 999 for no threshold.
-    '''
 
-    proc = {
-        'name': [
-            (str_filter,   str_find_all,   1.0, UrlFinder.html_title),
-            (words_filter, words_find_all, 0.3, UrlFinder.html_title),
-            (words_filter, words_find,     0.1, UrlFinder.html_title),
-            (str_filter,   str_find_all,   1.0, UrlFinder.meta_description),
-            (words_filter, words_find_all, 0.3, UrlFinder.meta_description),
-            (words_filter, words_find,     0.1, UrlFinder.meta_description),
-            (str.strip,    str_find_all,   1.0, UrlFinder.h1_text),
-            (words_filter, words_find_all, 0.3, UrlFinder.h1_text),
-            (words_filter, words_find,     0.1, UrlFinder.h1_text),
-            (str_filter,   str_find_all,   1.0, UrlFinder.body_text),
-            (words_filter, sentence_find,  0.5, UrlFinder.body_text),
-        ],
-        'city': [
-            (str_filter,   str_find_all,   0.1, UrlFinder.html_title),
-            (str_filter,   str_find_all,   0.1, UrlFinder.meta_description),
-            (str_filter,   str_find_all,  0.05, UrlFinder.body_text),
-        ],
-        'country': [
-            (str_filter,   str_find_all,   0.1, UrlFinder.html_title),
-            (str_filter,   str_find_all,   0.1, UrlFinder.meta_description),
-            (str_filter,   str_find_all,  0.05, UrlFinder.body_text),
-        ],
-        'phone': [
-            (str_filter,   str_find,       1.0, UrlFinder.html_title),
-            (str_filter,   str_find,       0.5, UrlFinder.meta_description),
-            (str_filter,   str_find,       0.1, UrlFinder.body_text),
-        ],
-        'postcode': [
-            (str_filter,   str_find,       0.1, UrlFinder.body_text),
-        ],
-        'street_line_1': [
-            (str_filter,   str_find_all,   0.5, UrlFinder.body_text),
-        ],
-    }
+    Up to @workers rows are processed concurrently by a pool of threads. Each
+    search engine keeps its own pause between the requests, adapted to the
+    engine's throttling (see @SearchEngine), so the webpages of one row are
+    downloaded while the other rows are waiting for their search results. The
+    input is read by chunks of @chunksize rows: the rows to process are
+    dispatched to the pool, and each row is written to the output file in the
+    input order as soon as it and all the rows before it are done.
+
+    If @processes is set, the webpages are parsed and validated by the pool of
+    @processes worker processes shared by all the rows.
+    '''
 
     u = UrlFinder([
             #GoogleCustomSearch(filter=True),
             GoogleSearch(num=30),
         ],
-        proc, home_weight=0.0, skip_social=True, home_only=True, threshold=0.05
+        PROC, home_weight=0.0, skip_social=True, home_only=True, threshold=0.05,
+        processes=processes
     )
 
     i = 1
 
-    with open(fn_input, 'r', encoding='utf-8') as fi, \
-        open(fn_output, 'w', newline='', encoding='utf-8') as fo:
+    with open(fn_input, 'r', buffering=1<<20, encoding='utf-8') as fi, \
+        open(fn_output, 'w', buffering=1<<20, newline='', encoding='utf-8') as fo:
 
         csv.register_dialect('excelesc', doublequote=False, delimiter=',', escapechar='\\', quoting=csv.QUOTE_MINIMAL)
 
-        samples = csv.DictReader(fi, dialect='excelesc')
+        samples = csv.reader(fi, dialect='excelesc')
 
-        fields = samples.fieldnames
+        fields = next(samples)
 
-        if 'website' not in samples.fieldnames:
+        if 'website' not in fields:
             fields.append('website')
 
-        dw = csv.DictWriter(fo, fieldnames=fields, dialect='excelesc')
+        idx_website = fields.index('website')
+        num_fields = len(fields)
 
-        dw.writeheader()
+        dw = csv.writer(fo, dialect='excelesc')
 
-        for s in samples:
-            brk = (limit > 0) and (i - start >= limit)
+        dw.writerow(fields)
 
-            if not brk and i >= start and (not s.get('website') or update):
-                lnk_found = u.get('"{}"'.format(s['name']), s)
-                #lnk_found = u.get('"{}" +"{}" +"{}"'.format(s['name'], s['country'], s['city']), s)
+        def process(row):
+            # Row dict is only built for the rows being processed
+            s = dict(zip(fields, row))
 
-                print(s['id'], '>', s['name'], '>', lnk_found)
+            lnk_found = u.get('"{}"'.format(s['name']), s)
+            #lnk_found = u.get('"{}" +"{}" +"{}"'.format(s['name'], s['country'], s['city']), s)
 
-                s.update({'website': lnk_found})
+            print(s['id'], '>', s['name'], '>', lnk_found)
 
-                sleep(15)
+            row[idx_website] = lnk_found
 
-            dw.writerow(s)
+            return row
 
-            i = i + 1
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            while True:
+                raw = list(islice(samples, chunksize))
+
+                if not raw:
+                    break
+
+                # Blank lines are skipped as DictReader does. A chunk of blank
+                # lines only is not the end of the input
+                chunk = [row for row in raw if row]
+
+                # Preparing the rows of the chunk and dispatching the ones to process
+                for n, row in enumerate(chunk):
+                    # Short rows and rows of the input without "website" column are padded
+                    if len(row) < num_fields:
+                        row += [''] * (num_fields - len(row))
+
+                    brk = (limit > 0) and (i - start >= limit)
+
+                    if not brk and i >= start and (not row[idx_website] or update):
+                        chunk[n] = ex.submit(process, row)
+
+                    i = i + 1
+
+                # Writing the rows in the input order, each one as soon as it and
+                # all the rows before it are done. The rows not started yet are
+                # cancelled if any row fails, as the rows after it are never
+                # written anyway
+                try:
+                    for r in chunk:
+                        dw.writerow(r.result() if isinstance(r, Future) else r)
+
+                except BaseException:
+                    for r in chunk:
+                        if isinstance(r, Future):
+                            r.cancel()
+
+                    raise
 
         fo.close()
 
@@ -281,9 +500,11 @@ if __name__ == '__main__':
 
     start = 0
     limit = 0
+    workers = 4
+    processes = 0
 
     try:
-        opts, args = getopt.getopt(sys.argv[1:], 's:l:i:o:hu')
+        opts, args = getopt.getopt(sys.argv[1:], 's:l:w:p:i:o:hu')
 
         for opt, val in opts:
             if opt == '-i':
@@ -298,6 +519,12 @@ if __name__ == '__main__':
             if opt == '-l':
                 limit = int(val)
 
+            if opt == '-w':
+                workers = max(1, int(val))
+
+            if opt == '-p':
+                processes = max(0, int(val))
+
             if opt == '-h':
                 help_and_quit()
 
@@ -310,5 +537,5 @@ if __name__ == '__main__':
     if not fn_input or not fn_output or fn_input == fn_output:
         help_and_quit()
 
-    main(fn_input, fn_output, start, limit)
+    main(fn_input, fn_output, start, limit, workers, processes=processes)
 
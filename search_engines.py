@@ -1,14 +1,109 @@
 from bs4 import BeautifulSoup
-from urllib.parse import urlsplit, unquote
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from multiprocessing import get_context
+from urllib.parse import urlsplit, urlunsplit, unquote
 from html import unescape
 from random import choice
+from requests.adapters import HTTPAdapter
+from threading import Lock, Semaphore
+from time import monotonic, sleep
+from urllib3.util.retry import Retry
 
-import requests, json, re, unicodedata, urllib3
+import requests, json, re, sys, unicodedata, urllib3
 
 
 urllib3.disable_warnings()
 
 
+# Tags holding no text of the webpage, BeautifulSoup leaves their contents out
+# of the text as well
+NON_TEXT_TAGS = ['script', 'style', 'template']
+
+# The C-backed lxml parser is much faster, the pure-Python one is the fallback.
+# The crawled webpages are parsed by lxml directly, and the content functions
+# evaluate the compiled XPath expressions on the tree
+try:
+    from lxml import etree, html as lxml_html
+    HTML_PARSER = 'lxml'
+
+    XPATH_DESCR = etree.XPath('string((//meta[@name="description"])[1]/@content)')
+    XPATH_TITLE = etree.XPath('string((//title)[1])')
+    XPATH_BODY  = etree.XPath('(//body)[1]')
+    XPATH_TEXT  = etree.XPath('(//body)[1]//text()[not({})]'.format(
+        ' or '.join('ancestor::' + t for t in NON_TEXT_TAGS)))
+    XPATH_H1    = etree.XPath('string((//h1)[1])')
+
+except ImportError:
+    lxml_html   = None
+    HTML_PARSER = 'html.parser'
+
+# The webpages are parsed by Lexbor via selectolax if it is installed, which is
+# even faster. Otherwise lxml or BeautifulSoup is used
+try:
+    from selectolax.lexbor import LexborHTMLParser
+
+except ImportError:
+    LexborHTMLParser = None
+
+# The API responses are parsed by orjson if it is installed. Its decoding error
+# is a subclass of json.JSONDecodeError, so the same exception is caught anyway
+try:
+    from orjson import loads as json_loads
+
+except ImportError:
+    json_loads = json.loads
+
+
+# "User-Agent" values rotated in the requests to the search engines
+BOT_AGENTS = (
+    'Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15) AppleWebKit/605.1.15 (KHTML, like Gecko) Mobile/15E148 DuckDuckGo/7; +http://www.google.com/bot.html)',
+    'Mozilla/5.0 (compatible; bingbot/2.0; +http://www.bing.com/bingbot.htm)',
+    'Mozilla/5.0 (compatible; YandexAccessibilityBot/3.0; +http://yandex.com/bots)',
+    'Mozilla/5.0 (compatible; Yahoo! Slurp/3.0; http://help.yahoo.com/help/us/ysearch/slurp)',
+)
+
+# "User-Agent" values rotated in the requests to the crawled websites
+BROWSER_AGENTS = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/94.0.4606.81 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:93.0) Gecko/20100101 Firefox/93.0',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/95.0.4638.54 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/94.0.4606.71 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/94.0.4606.81 Safari/537.36',
+    'Mozilla/5.0 (X11; Linux x86_64; rv:93.0) Gecko/20100101 Firefox/93.0',
+)
+
+
+def make_session(status_forcelist=(), backoff_factor=0.3):
+    '''Creates HTTP session keeping the connections alive and pooled, so the
+    requests to the same host reuse them. Failed connections are retried
+    with an exponential back-off. The "Retry-After" header of the responses
+    is ignored, so the server cannot make the request sleep for long.
+
+    Input
+        @status_forcelist: tuple of HTTP status codes the request is retried on as
+                           well. The last response is returned if all tries fail;
+        @backoff_factor:   float, the back-off before the second retry in seconds,
+                           it is doubled for every next one.
+
+    Returns
+        requests.Session
+    '''
+
+    a = HTTPAdapter(pool_connections=64, pool_maxsize=64,
+        max_retries=Retry(total=3, backoff_factor=backoff_factor,
+            status_forcelist=status_forcelist, raise_on_status=False,
+            respect_retry_after_header=False))
+
+    s = requests.Session()
+
+    s.mount('http://', a)
+    s.mount('https://', a)
+
+    return s
+
+
 '''
 Search engines
 '''
@@ -24,10 +119,45 @@ class SearchEngine(object):
     This method is only declared in the class and raises "NotImplementedError"
     exception, and should be implemented in the child classes to make it work
     properly.
+
+    The ".search" method wraps ".get_results" making it safe to be called from
+    several threads, and keeps the pause between the requests to the search
+    engine. The pause adapts to the responses: it is doubled up to @MAX_DELAY
+    seconds and the request is retried while the engine throttles the requests
+    (HTTP 429 or 503), and it goes back down to @DELAY seconds on success.
+    The results are kept for @CACHE_TTL seconds, so the repeated query costs
+    no request at all. Up to @CACHE_SIZE queries are kept.
     '''
 
     BASE_URL = None
     NUM = 10
+    DELAY = 0
+    MAX_DELAY = 60
+    RETRIES = 3
+    TIMEOUT = (10, 30)
+    CACHE_TTL = 900
+    CACHE_SIZE = 10000
+
+
+    def __init__(self, delay=None):
+        '''Inits the request lock and the rate limit of the instance.
+
+        Input
+            @delay: float, minimal pause in seconds between the requests to the
+                    search engine. If set to None, the default @DELAY is used
+        '''
+
+        if delay is not None:
+            self.DELAY = delay
+
+        self._lock    = Lock()
+        self._last    = None
+        self._delay   = self.DELAY
+        self._session = make_session()
+
+        # Search results by (@NUM, query), each one along with its expiry time
+        self._cache   = {}
+
 
     @property
     def content(self):
@@ -77,25 +207,80 @@ class SearchEngine(object):
             str
         '''
 
-        h = requests.utils.default_headers()
+        h = {'User-Agent': choice(BOT_AGENTS)}
+
+        r = self._session.get(self.BASE_URL, params=p, headers=h, timeout=self.TIMEOUT)
+
+        # The search engine throttles the requests, backing off and retrying
+        for _ in range(self.RETRIES):
+            if r.status_code not in (429, 503):
+                break
+
+            self._delay = min(self.MAX_DELAY, max(1, self._delay) * 2)
 
-        h.update({
-            'User-Agent': choice([
-                'Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)',
-                'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15) AppleWebKit/605.1.15 (KHTML, like Gecko) Mobile/15E148 DuckDuckGo/7; +http://www.google.com/bot.html)',
-                'Mozilla/5.0 (compatible; bingbot/2.0; +http://www.bing.com/bingbot.htm)',
-                'Mozilla/5.0 (compatible; YandexAccessibilityBot/3.0; +http://yandex.com/bots)',
-                'Mozilla/5.0 (compatible; Yahoo! Slurp/3.0; http://help.yahoo.com/help/us/ysearch/slurp)',
-            ])
-        })
+            sleep(self._delay)
 
-        self._content = requests.get(self.BASE_URL, params=p, headers=h).text
+            r = self._session.get(self.BASE_URL, params=p, headers=h, timeout=self.TIMEOUT)
+
+        if r.status_code == 200:
+            self._delay = max(self.DELAY, self._delay * 0.9)
+
+        self._content = r.text
 
 
     def get_results(self, q):
         raise NotImplementedError('This method requires to be implemented.')
 
 
+    def search(self, q):
+        '''Calls ".get_results" holding the lock of the instance, so the content
+        is not overwritten by the other threads. Waits for the rest of the
+        current pause since the last request to the search engine.
+
+        Input
+            @q: query string
+
+        Returns
+            list of dicts -> [{'link': str, 'title': str, 'descr': str}, ...]
+        '''
+
+        key = (self.NUM, q)
+
+        # The cached results are returned without waiting for the lock
+        hit = self._cache.get(key)
+
+        if hit is not None and hit[0] > monotonic():
+            return list(hit[1])
+
+        with self._lock:
+            if self._last is not None:
+                pause = self._last + self._delay - monotonic()
+
+                if pause > 0:
+                    sleep(pause)
+
+            try:
+                res = self.get_results(q)
+
+            finally:
+                self._last = monotonic()
+
+            # Failed requests give no results as well, so empty results are not cached
+            if res and self.CACHE_TTL > 0:
+                if len(self._cache) >= self.CACHE_SIZE:
+                    now = monotonic()
+
+                    self._cache = {k: v for k, v in self._cache.items() if v[0] > now}
+
+                    # Dropping the oldest query if none has expired
+                    if len(self._cache) >= self.CACHE_SIZE:
+                        del self._cache[next(iter(self._cache))]
+
+                self._cache[key] = (self._last + self.CACHE_TTL, res)
+
+            return list(res)
+
+
 class GoogleCustomSearch(SearchEngine):
     '''A search engine based on "Google Custom Search API". It requires <ID> and
     <API KEY> to serve the requests.
@@ -112,7 +297,7 @@ class GoogleCustomSearch(SearchEngine):
     ID = '<Google_App_Id>'
 
 
-    def __init__(self, api_key=None, app_id=None, num=10, filter=None):
+    def __init__(self, api_key=None, app_id=None, num=10, filter=None, delay=None):
         '''Creates an instance of the class.
 
         Input
@@ -123,9 +308,12 @@ class GoogleCustomSearch(SearchEngine):
             @num:     int, the number of the search results;
             @filter:  query string filter function. If set to None, overrides
                       default filter. Set it to SearchEngine.filter_query_string('')
-                      to baypass the query string filter.
+                      to baypass the query string filter;
+            @delay:   float, minimal pause in seconds between the requests.
         '''
 
+        super().__init__(delay)
+
         if api_key is not None:
             self.API_KEY = api_key
 
@@ -181,7 +369,7 @@ class GoogleCustomSearch(SearchEngine):
         '''
 
         try:
-            return self._normalize(json.loads(self._content, encoding='utf-8'))
+            return self._normalize(json_loads(self._content))
 
         except json.decoder.JSONDecodeError:
             return []
@@ -212,7 +400,7 @@ class GoogleCustomSearch(SearchEngine):
             except json.decoder.JSONDecodeError:
                 return []
 
-        except requests.exceptions.ConnectionError:
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
             return []
 
 
@@ -231,18 +419,22 @@ class GoogleSearch(SearchEngine):
     '''
 
     BASE_URL = 'https://www.google.com/search'
+    DELAY = 1
 
 
-    def __init__(self, num=10, filter=None):
+    def __init__(self, num=10, filter=None, delay=None):
         '''Creates an instance of the class.
 
         Input
             @num:    int, the number of the search results;
             @filter: query string filter function. If set to None, overrides
                      default filter. Set it to SearchEngine.filter_query_string('')
-                     to baypass the query string filter
+                     to baypass the query string filter;
+            @delay:  float, minimal pause in seconds between the requests.
         '''
 
+        super().__init__(delay)
+
         self._fqs = filter or self.filter_query_string()
 
         self.NUM = 10 if num < 1 or num > 30 else num
@@ -270,7 +462,14 @@ class GoogleSearch(SearchEngine):
             str containing URL
         '''
 
-        u = unquote(re.sub('&sa=.+&ved=.+&usg=.+', '', url.replace('/url?q=', '')))
+        # Dropping the redirect prefix and the tracking parameters "&sa=...&ved=...&usg=..."
+        # which Google appends to the end of the link
+        if url.startswith('/url?q='):
+            url = url[7:]
+
+        i = url.find('&sa=')
+
+        u = unquote(url[:i] if i >= 0 else url)
 
         if home:
             p = urlsplit(u)
@@ -286,7 +485,7 @@ class GoogleSearch(SearchEngine):
 
         res = []
 
-        main = BeautifulSoup(self._content, 'html.parser').find('div', attrs={'id': 'main'})
+        main = BeautifulSoup(self._content, HTML_PARSER).find('div', attrs={'id': 'main'})
 
         if main:
             divs = main.div.find_next_siblings('div')
@@ -300,7 +499,8 @@ class GoogleSearch(SearchEngine):
                 if not ch:
                     continue
 
-                ch = list(ch)
+                # Element children only, text nodes between them are skipped
+                ch = ch.find_all(recursive=False)
 
                 # company widget exists
                 if len(ch) == 4:
@@ -314,8 +514,8 @@ class GoogleSearch(SearchEngine):
                     else:
                         descr = ''
 
-                    if a and len(a) > 1:
-                        alink = ch[2].find_all('a')[1].attrs['href']
+                    if len(a) > 1:
+                        alink = a[1].attrs['href']
 
                         res.append({
                             'link': GoogleSearch._parse_url(alink, True),
@@ -361,7 +561,7 @@ class GoogleSearch(SearchEngine):
 
             return self.results()
 
-        except requests.exceptions.ConnectionError:
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
             return []
 
 
@@ -375,8 +575,32 @@ class UrlFinder():
     _exclude_ext = {'.jpg', '.png', '.pdf', '.jpeg', '.gif', '.avi', '.mp4', '.mkv', '.mp3', '.mpg', '.mpeg'}
     _exclude_dom = ('linkedin', 'glassdoor', 'facebook', 'societe', 'wikipedia', 'google', 'youtube')
 
+    # Latin-1 and Latin Extended letters with diacritical signs mapped to the
+    # regular characters, as the NFD normalization followed by stripping of
+    # the combining marks does
+    _accent_tbl = {
+        c: ''.join(d for d in unicodedata.normalize('NFD', chr(c)) if unicodedata.category(d) != 'Mn')
+            for c in range(0xc0, 0x250)
+    }
+
+
+    # Validator function of the worker process, see "._init_worker"
+    _worker_score = None
+
+    # The number of the recently downloaded webpages kept by the instance
+    CACHE_SIZE = 256
 
-    def __init__(self, engines, proc, home_weight=1, skip_social=True, home_only=False, threshold=0.3):
+    # The number of the webpages downloaded from the same host at once
+    HOST_CONNECTIONS = 4
+
+    # Responses of the overloaded or throttling websites, the download is retried
+    RETRY_STATUS = (429, 500, 502, 503, 504)
+
+    # Connect and read timeouts of the downloads in seconds
+    TIMEOUT = (5, 15)
+
+
+    def __init__(self, engines, proc, home_weight=1, skip_social=True, home_only=False, threshold=0.3, processes=0, threads=16):
         '''Creates an instance of the crawler.
 
         Input
@@ -394,18 +618,254 @@ class UrlFinder():
                           the validation process;
             @home_only:   bool, defines skipping or not the non-homepage URLs;
             @threshold:   float, a value of weight for the URLs to be filtered below or
-                          equal this value. Set it to 999 for no threshold.
+                          equal this value. Set it to 999 for no threshold;
+            @processes:   int, the number of worker processes parsing and validating the
+                          webpages, while the calling thread downloads the next ones. The
+                          pool may be shared by several threads calling ".get". Set it to
+                          0 to do all the work in the calling thread;
+            @threads:     int, the number of threads querying the search engines and
+                          downloading the webpages at once.
         '''
 
         self._engines     = list(engines)
 
-        self._processors  = procs
-        self._exclude_re  = re.compile('(' + ')|('.join(['^http.*://.*' + ex + '\..{2,}/*.*$' for ex in self._exclude_dom]) + ')')
+        # Validation rules are frozen into tuples of (field name, tuple of rules)
+        # pairs, walked for every URL
+        self._processors  = tuple((k, tuple(v)) for k, v in proc.items()) \
+            if proc is not None else None
+        self._prepare, self._score = UrlFinder._compile(self._processors) \
+            if proc is not None else (None, None)
+        # Excluded extensions are checked by a single str.endswith call, and excluded
+        # domain names are searched in the host name part of the URL only
+        self._exclude_ext = tuple(self._exclude_ext)
+        self._exclude_re  = re.compile(r'^http[^:]*://[^/]*(?:' + '|'.join(map(re.escape, self._exclude_dom)) + r')\.')
         self._skip_social = skip_social
         self._home_weight = home_weight
         self._home_only   = home_only
         self._threshold   = threshold
 
+        # Downloads are retried on connection errors and on the failure responses
+        # of the websites, and limited by the number of connections per host
+        self._session = make_session(self.RETRY_STATUS, 0.5)
+        self._hosts   = {}
+
+        # Webpages returned for several queries or by several engines are
+        # downloaded once
+        self._fetch = lru_cache(maxsize=self.CACHE_SIZE)(self._download)
+
+        # Threads querying the search engines and downloading the webpages, shared
+        # by all the calls of ".get"
+        self._threads = ThreadPoolExecutor(threads)
+
+        # Worker processes are spawned rather than forked, since the crawler may
+        # run several threads. Each one compiles its own validator functions
+        self._pool = ProcessPoolExecutor(
+            processes, mp_context=get_context('spawn'),
+            initializer=UrlFinder._init_worker, initargs=(self._processors,)
+        ) if processes > 0 and proc is not None else None
+
+
+    def _download(self, url):
+        '''Downloads the webpage by its @url. It also does rotation of the
+        "User-Agent" parameter value in the HTTP-header.
+
+        Input
+            @url: str
+
+        Returns
+            str
+        '''
+
+        h = {'User-Agent': choice(BROWSER_AGENTS)}
+
+        # Creating the semaphore of the host by dict.setdefault is thread-safe
+        with self._hosts.setdefault(urlsplit(url)[1], Semaphore(self.HOST_CONNECTIONS)):
+            return self._session.get(url, headers=h, verify=False, timeout=self.TIMEOUT).text
+
+
+    @staticmethod
+    def _search(engine, query):
+        '''Gets the search results of the @engine, a failed engine gives no results
+
+        Input
+            @engine: instance of any SearchEngine child class;
+            @query:  str
+
+        Returns
+            list of dicts -> [{'link': str, 'title': str, 'descr': str}, ...]
+        '''
+
+        try:
+            return engine.search(query)
+
+        except Exception as ex:
+            print(ex)
+
+            return []
+
+
+    @staticmethod
+    def canonical_url(url):
+        '''Normalizes @url for caching: lowercases the scheme and the host name,
+        drops the fragment and sets the root path if it is empty
+
+        Input
+            @url: str
+
+        Returns
+            str
+        '''
+
+        p = urlsplit(url)
+
+        return urlunsplit((p.scheme.lower(), p.netloc.lower(), p.path or '/', p.query, ''))
+
+
+    @staticmethod
+    def _init_worker(processors):
+        '''Inits the worker process with the validator function of the rules
+        @processors, as they are frozen by ".__init__". The worker only needs
+        the validator, so no crawler instance is created
+        '''
+
+        UrlFinder._worker_score = UrlFinder._compile(processors)[1]
+
+
+    @staticmethod
+    def _score_page(w, html, a, lim):
+        '''Parses the webpage @html and applies the validation rules of the worker
+        process to it. Arguments are the same as of "score" function generated
+        by "._compile"
+
+        Returns
+            float
+        '''
+
+        return UrlFinder._worker_score(w, html, UrlFinder.parse(html), a, lim)
+
+
+    @staticmethod
+    def _compile(processors):
+        '''Generates the functions specialized for the validation rules
+        @processors, frozen by ".__init__", with every rule inlined as
+        a straight-line statement:
+
+            prepare(params) -> tuple of search strings, the field value and its
+                               filtered forms, computed once per query;
+            score(w, html, soup, a, lim) -> @w increased by the weights of the
+                               rules for the webpage, @a is the tuple from "prepare".
+
+        The texts extracted by the content functions are accent-stripped once
+        per webpage and only if any rule uses them. The rules are grouped by
+        their content functions in the order the functions first appear in the
+        rules, so each text is extracted right before its group of rules, and
+        the texts listed last (the body text) are not extracted at all if the
+        webpage has already lost.
+
+        A rule is bounded if its weight is not negative and its search function
+        declares the upper bound of its results with "max_result" attribute.
+        Before each rule followed by the bounded ones only, "score" adds up the
+        bounds of the rest of rules in the order they are applied. So once the
+        weight can not reach @lim even if every rule gives its maximum, "score"
+        returns the weight reached so far, which is then below @lim as well.
+
+        Input
+            @processors: tuple of (field name, tuple of rules) pairs
+
+        Returns
+            tuple of functions -> (prepare, score)
+        '''
+
+        ns = {'strip': UrlFinder.strip_accents}
+        names = {}
+
+        # Binds an object to a short global name of the generated code
+        def bind(prefix, obj):
+            k = (prefix, id(obj))
+
+            if k not in names:
+                names[k] = '{}{}'.format(prefix, len(names))
+                ns[names[k]] = obj
+
+            return names[k]
+
+        slots = {}
+        texts = {}
+
+        prepare = ['def prepare(params):']
+        values  = []
+        score   = ['def score(w, html, soup, a, lim):']
+        rules   = []
+
+        for i, (p_name, p_proc) in enumerate(processors):
+            v = 'v{}'.format(i)
+            v_slot = slots[p_name, None] = len(values)
+
+            prepare.append('    {} = params.get({})'.format(v, bind('n', p_name)))
+            values.append(v)
+
+            for str_f, str_p, weight, content_p in p_proc:
+                # Each filter is applied once per field, and not callable
+                # filters take the field value as is
+                if not callable(str_f):
+                    str_f = None
+
+                if (p_name, str_f) not in slots:
+                    slots[p_name, str_f] = len(values)
+                    values.append('{}({}) if {} is not None else None'.format(bind('f', str_f), v, v))
+
+                max_result = getattr(str_p, 'max_result', None)
+                bound = weight * max_result \
+                    if max_result is not None and weight >= 0 else float('inf')
+
+                rules.append((bound, v_slot, slots[p_name, str_f], str_p, weight, content_p))
+
+        # Stable sort keeps the order of the rules of the same content function
+        order = {}
+
+        for r in rules:
+            order.setdefault(r[5], len(order))
+
+        rules.sort(key=lambda r: order[r[5]])
+
+        for i, (bound, v_slot, f_slot, str_p, weight, content_p) in enumerate(rules):
+            # The bounds are added one by one as the rules add their results,
+            # so the rounding of the sum never rejects a webpage reaching @lim
+            rest = [r[0] for r in rules[i:]]
+
+            if float('inf') not in rest:
+                score.append('    if w + {} < lim:'.format(' + '.join(map(repr, rest))))
+                score.append('        return w')
+
+            # The rule is applied if the field value exists
+            score.append('    if a[{}] is not None:'.format(v_slot))
+
+            # Content function None stands for the raw html
+            if content_p is None:
+                text = 'html'
+            else:
+                if content_p not in texts:
+                    texts[content_p] = 't{}'.format(len(texts))
+
+                text = texts[content_p]
+
+                score.append('        if {} is None:'.format(text))
+                score.append('            {} = strip({}(soup))'.format(text, bind('c', content_p)))
+
+            score.append('        w += {}({}, a[{}]) * {}'.format(
+                bind('p', str_p), text, f_slot, bind('k', weight)))
+
+        prepare.append('    return ({},)'.format(', '.join(values)))
+
+        if texts:
+            score.insert(1, '    {} = None'.format(' = '.join(texts.values())))
+
+        score.append('    return w')
+
+        exec(compile('\n'.join(prepare + [''] + score) + '\n', '<proc>', 'exec'), ns)
+
+        return ns['prepare'], ns['score']
+
 
     def get(self, query, params):
         '''Finds an URL of the corporate website by a given search string
@@ -415,113 +875,134 @@ class UrlFinder():
             @params: dict of data fields and values to search in the webpage contents.
         '''
 
-        h = requests.utils.default_headers()
+        # Search results keyed by URL, the insertion order keeps the order of the results
+        results = {}
 
-        h.update({
-            'User-Agent': choice([
-                'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/94.0.4606.81 Safari/537.36',
-                'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:93.0) Gecko/20100101 Firefox/93.0',
-                'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/95.0.4638.54 Safari/537.36',
-                'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/94.0.4606.71 Safari/537.36',
-                'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/94.0.4606.81 Safari/537.36',
-                'Mozilla/5.0 (X11; Linux x86_64; rv:93.0) Gecko/20100101 Firefox/93.0',
-            ])
-        })
+        # Building the total list of URLs using all provided search engines,
+        # the engines are queried at once
+        for res in self._threads.map(self._search, self._engines, [query] * len(self._engines)):
 
-        results = []
+            # Adding only unique URLs, the result of the first engine returning the URL is kept
+            for r in res:
+                results.setdefault(r['link'], r)
 
-        # Building the total list of URLs using all provided search engines
-        for e in self._engines:
-            try:
-                res = e.get_results(query)
-
-                # Adding only unique URLs
-                for r in res:
-                    if r not in results:
-                        results.append(r)
+        results = list(results.values())
 
-            except Exception as ex:
-                print(ex)
+        # Excluded URLs weigh -1, the kept ones are weighted below
+        weights = [-1] * len(results)
+        keep = []
 
-        weights = []
+        # Without the validation rules the URLs are weighted by themselves only
+        scoring = self._score is not None and params is not None
 
-        # Looping through collected URLs
-        for r in results:
-            print('Retreiving from url:', r['link'])
+        # Filtered search strings do not depend on the URL, so they are
+        # prepared once for all the URLs
+        filtered = self._prepare(params) if scoring else None
 
+        # Partitioning collected URLs into the kept and the excluded ones
+        for i, r in enumerate(results):
             is_home = (
                 r['link'] == '{}://{}/'.format(*urlsplit(r['link'])[:2])
             )
 
-            if r['link'][-4:].lower() in self._exclude_ext or r['link'][-5:].lower() in self._exclude_ext or ( \
+            if not (r['link'].lower().endswith(self._exclude_ext) or ( \
                     self._skip_social and self._exclude_re.match(r['link']) ) or ( \
-                    self._home_only and not is_home ):
+                    self._home_only and not is_home )):
 
-                weights.append(-1)
+                keep.append((i, is_home))
 
-                continue
+        # Starting all the downloads of the kept URLs at once
+        if scoring:
+            print(''.join('Retreiving from url: {}\n'.format(results[i]['link']) for i, _ in keep), end='')
 
-            # Calculating the initial weight using "is_home" argument value and homepage threshold value
-            # @w will hold total weight of the URL
-            w = int(is_home) * self._home_weight
+            downloads = [self._threads.submit(self._fetch, self.canonical_url(results[i]['link'])) for i, _ in keep]
 
-            # Downloading and analysing the webpage content
-            if self._processors is not None and params is not None:
-                try:
-                    html = requests.get(r['link'], headers=h, verify=False).text
-                    soup = BeautifulSoup(html, 'html.parser')
+        else:
+            downloads = [None] * len(keep)
 
-                    content = {
-                        None: html
-                    }
+        # Analysing the webpages in the order of the search results
+        for (i, is_home), download in zip(keep, downloads):
+            weights[i] = self._score_url(results[i]['link'], is_home, download, filtered, weights)
 
-                    # Looping through the dict of validation rules and extracting
-                    # @p_name: field name, @p_proc: validation rules (list of tuples)
-                    for p_name, p_proc in self._processors.items():
+        weights = [w.result() if isinstance(w, Future) else w for w in weights]
 
-                        # Extracing search string linked to the field name @p_name
-                        p_str = params.get(p_name)
+        # Returning URL with maximum weight if it is greater or equal to the threshold value
+        if weights:
+            # The first of the equally weighted URLs wins as it is higher in the search results
+            idx = max(range(len(weights)), key=weights.__getitem__)
 
-                        # Search string is not empty
-                        if p_str is not None:
+            return results[idx]['link'] if weights[idx] >= self._threshold else None
 
-                            # Looping through the list of validation rules and extracting parameters:
-                            # preprocessor, search processor, weight of result, content preprocessor
-                            # @str_f: string filter function, @str_p: string search function, @weight,
-                            # @content_p: function returning content to search in
-                            for str_f, str_p, weight, content_p in p_proc:
+        else:
+            return None
 
-                                # Filters search string if filter function is provided
-                                #p_str_filtered = str_f(p_str) if str_f is not None else p_str
-                                p_str_filtered = str_f(p_str) if callable(str_f) else p_str
 
-                                # Does the content has been already filtered with this filter
-                                text = content.get(content_p)
+    def _score_url(self, link, is_home, download, filtered, weights):
+        '''Calculates the total weight of the kept URL
 
-                                # No. Ok, lets filter and save it for direct use in the next iteration
-                                if text is None:
-                                    text = self.strip_accents(content_p(soup))
-                                    content[content_p] = text
+        Input
+            @link:     str, the URL;
+            @is_home:  bool, the URL points to the homepage of the website;
+            @download: Future of the downloaded webpage, or None if the webpage is
+                       not validated;
+            @filtered: tuple of the search strings prepared for the query, see "._compile";
+            @weights:  list of the weights of the URLs, the ones not weighted yet are -1.
 
-                                # String search function call, multiply by the weight,
-                                # and summarise it with total weight
-                                w += str_p(text, p_str_filtered) * weight
+        Returns
+            float, or Future of float if the webpage is passed to the worker processes
+        '''
 
-                except requests.exceptions.ConnectionError as e:
-                    w = -1
+        # Calculating the initial weight using "is_home" argument value and homepage threshold value
+        w = int(is_home) * self._home_weight
 
-                    print('Unable to retreive data from url:', r['link'])
+        if download is None:
+            return w
 
-            weights.append(w)
+        try:
+            html = download.result()
 
-        # Returning URL with maximum weight if it is greater or equal to the threshold value
-        if weights:
-            idx, _ = sorted(enumerate(weights), key=lambda x: x[1], reverse=True)[0]
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            print('Unable to retreive data from url:', link)
 
-            return results[idx]['link'] if weights[idx] >= self._threshold else None
+            return -1
 
-        else:
-            return None
+        # Passing the webpage to the worker processes, the weight will be
+        # collected after all of the webpages have been analysed
+        if self._pool is not None:
+            return self._pool.submit(UrlFinder._score_page, w, html, filtered, self._threshold)
+
+        # Applying all the validation rules, each one multiplies the result of
+        # its string search function by the weight and adds it to total weight.
+        # The URL is given up as soon as it can reach neither the threshold
+        # nor the weight of the best URL so far
+        return self._score(w, html, self.parse(html), filtered, max([self._threshold] + weights))
+
+
+    @staticmethod
+    def parse(html):
+        '''Parses the webpage for the content functions below
+
+        Input
+            @html: str
+
+        Returns
+            LexborHTMLParser if selectolax is installed, lxml tree if lxml is installed,
+            BeautifulSoup otherwise
+        '''
+
+        if LexborHTMLParser is not None:
+            return LexborHTMLParser(html)
+
+        # lxml refuses empty documents and str with XML encoding declaration,
+        # BeautifulSoup takes them anyway
+        if lxml_html is not None:
+            try:
+                return lxml_html.document_fromstring(html)
+
+            except (etree.ParserError, ValueError):
+                pass
+
+        return BeautifulSoup(html, HTML_PARSER)
 
 
     @staticmethod
@@ -530,18 +1011,25 @@ class UrlFinder():
         the <meta name="description" content="content string">
 
         Input
-            @soup: BeautifulSoup
+            @soup: BeautifulSoup, LexborHTMLParser or lxml tree
 
         Returns
             str
         '''
 
-        try:
-            m = unescape(soup.findAll('meta', attrs={'name':'description'})[0]['content'])
-        except IndexError:
-            m = ''
+        if isinstance(soup, BeautifulSoup):
+            m = soup.find('meta', attrs={'name':'description'})
+
+            return unescape(m.get('content') or '') \
+                if m else ''
+
+        if LexborHTMLParser is not None:
+            m = soup.css_first('meta[name="description"]')
 
-        return m
+            return unescape(m.attributes.get('content') or '') \
+                if m else ''
+
+        return unescape(XPATH_DESCR(soup))
 
 
     @staticmethod
@@ -549,16 +1037,25 @@ class UrlFinder():
         '''Returns the title of the webpage, i.e. the content string inside the <title> tag.
 
         Input
-            @soup: BeautifulSoup
+            @soup: BeautifulSoup, LexborHTMLParser or lxml tree
 
         Returns
             str
         '''
 
-        t = soup.find('title')
+        if isinstance(soup, BeautifulSoup):
+            t = soup.find('title')
 
-        return unescape(t.text) \
-            if t else ''
+            return unescape(t.text) \
+                if t else ''
+
+        if LexborHTMLParser is not None:
+            t = soup.css_first('title')
+
+            return unescape(t.text()) \
+                if t else ''
+
+        return unescape(XPATH_TITLE(soup))
 
 
     @staticmethod
@@ -566,16 +1063,30 @@ class UrlFinder():
         '''Returns only the text content inside the <body> tag, stripping out other tags.
 
         Input
-            @soup: BeautifulSoup
+            @soup: BeautifulSoup, LexborHTMLParser or lxml tree
 
         Returns
             str
         '''
 
-        t = soup.find('body')
+        if isinstance(soup, BeautifulSoup):
+            t = soup.body
 
-        return unescape(t.text) \
-            if t else ''
+            return unescape(t.text) \
+                if t else ''
+
+        # The tags are stripped from a copy of the tree, the other content
+        # functions take the webpage as is
+        if LexborHTMLParser is not None:
+            soup = soup.clone()
+            soup.strip_tags(NON_TEXT_TAGS)
+
+            t = soup.body
+
+            return unescape(t.text()) \
+                if t else ''
+
+        return unescape(''.join(XPATH_TEXT(soup)))
 
 
     @staticmethod
@@ -583,15 +1094,27 @@ class UrlFinder():
         '''Returns the content inside the <body> tag.
 
         Input
-            @soup: BeautifulSoup
+            @soup: BeautifulSoup, LexborHTMLParser or lxml tree
 
         Returns
             str
         '''
 
-        t = soup.find('body')
+        if isinstance(soup, BeautifulSoup):
+            t = soup.body
 
-        return unescape(t) \
+            return unescape(str(t)) \
+                if t else ''
+
+        if LexborHTMLParser is not None:
+            t = soup.body
+
+            return unescape(t.html) \
+                if t else ''
+
+        t = XPATH_BODY(soup)
+
+        return unescape(etree.tostring(t[0], encoding='unicode', method='html', with_tail=False)) \
             if t else ''
 
 
@@ -600,16 +1123,25 @@ class UrlFinder():
         '''Returns the content string inside the <h1> tag.
 
         Input
-            @soup: BeautifulSoup
+            @soup: BeautifulSoup, LexborHTMLParser or lxml tree
 
         Returns
             str
         '''
 
-        t = soup.find('h1')
+        if isinstance(soup, BeautifulSoup):
+            t = soup.find('h1')
 
-        return unescape(t.text) \
-            if t else ''
+            return unescape(t.text) \
+                if t else ''
+
+        if LexborHTMLParser is not None:
+            t = soup.css_first('h1')
+
+            return unescape(t.text()) \
+                if t else ''
+
+        return unescape(XPATH_H1(soup))
 
 
     @staticmethod
@@ -624,8 +1156,33 @@ class UrlFinder():
             str
         '''
 
-        return ''.join([c for c in unicodedata.normalize('NFD', s) \
-            if unicodedata.category(c) != 'Mn'])
+        # Plain ASCII strings have nothing to strip
+        if s.isascii():
+            return s
+
+        s = s.translate(UrlFinder._accent_tbl)
+
+        # Mostly Latin strings are done by the translation table
+        if s.isascii():
+            return s
+
+        return unicodedata.normalize('NFD', s).translate(UrlFinder._combining_tbl())
+
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _combining_tbl():
+        '''Returns the translation table deleting all the combining marks (Unicode
+        category "Mn"). Building it scans all the code points, so it is built on
+        the first string not done by the Latin table, once per process
+
+        Returns
+            dict
+        '''
+
+        return dict.fromkeys(
+            c for c in range(sys.maxunicode + 1) if unicodedata.category(chr(c)) == 'Mn'
+        )
 
 
     @staticmethod